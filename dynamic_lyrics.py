@@ -1,9 +1,10 @@
 import tkinter as tk
 import time
 import pygame
-import re
 import os
+import sys
 from pydub import AudioSegment
+import song_catalog
 
 # -------- CONFIGURATION --------
 AUDIO_FILE = r"C:\Users\manik\DEVJAMS_25\01 Counting Stars.m4a"
@@ -12,34 +13,50 @@ TREBLE_CLEF = "🎼"
 FFMPEG_PATH = r".\ffmpeg.exe"
 
 # -------- READ LRC FILE --------
-word_list = []
+# Usage: python dynamic_lyrics.py [song id]  (ids come from `python song_catalog.py search ...`)
+song = None
+if len(sys.argv) > 1:
+    catalog = song_catalog.open_catalog()
+    try:
+        song = song_catalog.load_song(catalog, int(sys.argv[1]))
+    except (ValueError, KeyError):
+        print(f"Unknown song id {sys.argv[1]!r} - find one with: python song_catalog.py search <words>")
+        exit(1)
+    AUDIO_FILE = song["audio_file"]
+    word_list = song["word_list"]
+else:
+    _, _, word_list = song_catalog.parse_lrc(LRC_FILE)
+
 line_list = []
 current_line = []
-timestamp_pattern = re.compile(r'\[(\d+):(\d+\.\d+)\](.*)')
-
-with open(LRC_FILE, "r", encoding="utf-8") as f:
-    for line in f:
-        line = line.strip()
-        match = timestamp_pattern.match(line)
-        if match:
-            mins, secs, word = match.groups()
-            timestamp = int(mins) * 60 + float(secs)
-            word_list.append((timestamp, word))
-            current_line.append((timestamp, word))
-            if word.endswith(('.', '!', '?')):
-                line_list.append(current_line)
-                current_line = []
+for timestamp, word in word_list:
+    current_line.append((timestamp, word))
+    if word.endswith(('.', '!', '?')):
+        line_list.append(current_line)
+        current_line = []
 if current_line:
     line_list.append(current_line)
 
 # -------- CONVERT M4A TO WAV --------
 ext = os.path.splitext(AUDIO_FILE)[1].lower()
-if ext == ".m4a":
+if song is not None and song["cache_file"]:
+    AUDIO_FILE = song["cache_file"]  # already converted on a previous run
+elif ext == ".m4a":
     AudioSegment.converter = FFMPEG_PATH
-    song = AudioSegment.from_file(AUDIO_FILE, format="m4a")
-    temp_file = "temp_song.wav"
-    song.export(temp_file, format="wav")
+    song_audio = AudioSegment.from_file(AUDIO_FILE, format="m4a")
+    temp_file = "temp_song.wav" if song is None else song_catalog.cache_path_for(AUDIO_FILE)
+    # Export under a temporary name so a failed or interrupted run never leaves
+    # a truncated wav that looks like a valid cache
+    partial_file = temp_file + ".part"
+    try:
+        song_audio.export(partial_file, format="wav")
+        os.replace(partial_file, temp_file)
+    finally:
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
     AUDIO_FILE = temp_file
+    if song is not None:
+        song_catalog.record_cache(catalog, song["id"], temp_file)
 
 # -------- GUI SETUP --------
 root = tk.Tk()
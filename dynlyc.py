@@ -1,40 +1,52 @@
 import tkinter as tk
 import time
 import pygame
-import re
 import os
+import sys
 import ffmpeg  # ffmpeg-python
+import song_catalog
 
 # -------- CONFIG --------
 AUDIO_FILE = r"/Users/hardikchona/lyrics_env/venv/cs.m4a"
 LRC_FILE = r"/Users/hardikchona/lyrics_env/venv/cs.lrc"
 TEMP_FILE = "temp_song.wav"
 
-# -------- READ LRC FILE --------
-word_list = []
-timestamp_pattern = re.compile(r'\[(\d+):(\d+\.\d+)\](.*)')
-
-with open(LRC_FILE, "r", encoding="utf-8") as f:
-    for line in f:
-        line = line.strip()
-        match = timestamp_pattern.match(line)
-        if match:
-            mins, secs, word = match.groups()
-            timestamp = int(mins)*60 + float(secs)
-            # Clean the word text - remove any remaining timestamp artifacts
-            word = re.sub(r'\[\d+:\d+\.\d+\]', '', word).strip()
-            if word:  # Only add non-empty words
-                word_list.append((timestamp, word))
+# -------- LOAD SONG --------
+# Usage: python dynlyc.py [song id]  (ids come from `python song_catalog.py search ...`)
+song = None
+if len(sys.argv) > 1:
+    catalog = song_catalog.open_catalog()
+    try:
+        song = song_catalog.load_song(catalog, int(sys.argv[1]))
+    except (ValueError, KeyError):
+        print(f"Unknown song id {sys.argv[1]!r} - find one with: python song_catalog.py search <words>")
+        exit(1)
+    AUDIO_FILE = song["audio_file"]
+    word_list = song["word_list"]
+    if song["cache_file"]:
+        AUDIO_FILE = song["cache_file"]  # already converted on a previous run
+    else:
+        TEMP_FILE = song_catalog.cache_path_for(AUDIO_FILE)
+else:
+    _, _, word_list = song_catalog.parse_lrc(LRC_FILE)
 
 # -------- CONVERT M4A TO WAV --------
 ext = os.path.splitext(AUDIO_FILE)[1].lower()
 if ext == ".m4a":
+    # Convert under a temporary name so a failed or interrupted run never leaves
+    # a truncated wav that looks like a valid cache
+    partial_file = TEMP_FILE + ".part"
     try:
-        ffmpeg.input(AUDIO_FILE).output(TEMP_FILE).run(overwrite_output=True, quiet=True)
-        AUDIO_FILE = TEMP_FILE
+        ffmpeg.input(AUDIO_FILE).output(partial_file, format="wav").run(overwrite_output=True, quiet=True)
+        os.replace(partial_file, TEMP_FILE)
     except ffmpeg.Error as e:
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
         print("Error converting audio:", e.stderr.decode())
         exit(1)
+    AUDIO_FILE = TEMP_FILE
+    if song is not None:
+        song_catalog.record_cache(catalog, song["id"], TEMP_FILE)
 
 # -------- GUI SETUP --------
 root = tk.Tk()
@@ -232,6 +244,6 @@ info_label.pack()
 # -------- START APPLICATION --------
 root.mainloop()
 
-# Clean up temp file if created
-if os.path.exists(TEMP_FILE):
+# Clean up temp file if created (catalog songs keep theirs as a cache)
+if song is None and os.path.exists(TEMP_FILE):
     os.remove(TEMP_FILE)
\ No newline at end of file
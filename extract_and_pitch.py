@@ -3,6 +3,7 @@ import json
 import numpy as np
 import librosa
 from pydub import AudioSegment
+import song_catalog
 
 # --- make sure ffmpeg paths are correct on Windows ---
 AudioSegment.converter = r"ffmpeg.exe"
@@ -16,7 +17,7 @@ fmin = 80                     # min freq to detect (Hz)
 fmax = 1000                   # max freq to detect (Hz)
 hop_length = 512
 print_every = 20
-output_json = "pitch_output.json"
+output_json = os.path.splitext(audio_m4a)[0] + song_catalog.PITCH_SUFFIX  # found by song_catalog.py
 
 # ====== STEP 0: convert m4a -> wav (if not already) ======
 if not os.path.exists(audio_wav):
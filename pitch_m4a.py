@@ -1,7 +1,9 @@
+import os
 import librosa
 import numpy as np
 import json
 from pydub import AudioSegment
+import song_catalog
 
 # Use the FFmpeg executables from the same folder as the script
 AudioSegment.converter = r"ffmpeg.exe"
@@ -21,7 +23,7 @@ fmin = 80                  # Min frequency for singing
 fmax = 1000                # Max frequency for singing
 hop_length = 512           # Hop length for analysis
 print_every = 20           # Print every N frames
-output_json = "pitch_output.json"
+output_json = os.path.splitext(audio_m4a)[0] + song_catalog.PITCH_SUFFIX  # found by song_catalog.py
 
 # ====== LOAD AUDIO ======
 y, sr = librosa.load(audio_wav, sr=None, duration=duration_sec)
@@ -0,0 +1,334 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+
+# -------- CONFIG --------
+# Next to this script, so players started from any folder share one catalog
+CATALOG_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "karaoke_catalog.db")
+AUDIO_EXTENSIONS = (".mp3", ".m4a", ".wav", ".flac", ".ogg")
+PITCH_SUFFIX = "_pitch.json"      # <song>_pitch.json next to the audio file
+CACHE_SUFFIX = "_cache.wav"       # <song>_cache.wav, converted audio for pygame
+MIN_PREFIX = 2                    # shortest last term searched as a prefix (matches prefix index)
+
+timestamp_pattern = re.compile(r'\[(\d+):(\d+\.\d+)\](.*)')
+tag_pattern = re.compile(r'^\[(ti|ar|al):(.*)\]$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS songs (
+    id          INTEGER PRIMARY KEY,
+    title       TEXT NOT NULL,
+    artist      TEXT,
+    audio_path  TEXT NOT NULL UNIQUE,
+    audio_mtime REAL,
+    audio_size  INTEGER,
+    lrc_path    TEXT,
+    lrc_mtime   REAL,
+    lrc_hash    TEXT,
+    pitch_path  TEXT,
+    pitch_mtime REAL,
+    cache_path  TEXT,
+    words_json  TEXT,
+    pitch_json  TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts USING fts5(
+    title, artist, lyrics,
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+"""
+
+
+# -------- DATABASE --------
+def open_catalog(db_path=CATALOG_DB):
+    """Open (and create if needed) the song catalog database"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# -------- LRC PARSING --------
+def parse_lrc(lrc_file):
+    """Parse an LRC file into (title, artist, word_list) - same rules as the players"""
+    title = None
+    artist = None
+    word_list = []
+    with open(lrc_file, "rb") as f:
+        data = f.read()
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = data.decode("latin-1")  # older LRC files are often Latin-1
+    for line in text.splitlines():
+        line = line.strip()
+        tag = tag_pattern.match(line)
+        if tag:
+            key, value = tag.group(1), tag.group(2).strip()
+            if key == "ti":
+                title = value or title
+            elif key == "ar":
+                artist = value or artist
+            continue
+        match = timestamp_pattern.match(line)
+        if match:
+            mins, secs, word = match.groups()
+            timestamp = int(mins)*60 + float(secs)
+            word = re.sub(r'\[\d+:\d+\.\d+\]', '', word).strip()
+            if word:
+                word_list.append((timestamp, word))
+    return title, artist, word_list
+
+
+def file_hash(path):
+    """SHA-1 of a file's contents, used to skip re-parsing on touch-only changes"""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _mtime(path):
+    return os.path.getmtime(path) if path and os.path.exists(path) else None
+
+
+def _artifact(audio_file, suffix):
+    path = os.path.splitext(audio_file)[0] + suffix
+    return path if os.path.exists(path) else None
+
+
+# -------- INDEXING --------
+def _index_song(conn, audio_file, row):
+    """Insert or refresh one song; only re-reads files whose mtime changed"""
+    stat = os.stat(audio_file)
+    lrc_file = _artifact(audio_file, ".lrc")
+    pitch_file = _artifact(audio_file, PITCH_SUFFIX)
+    cache_file = _artifact(audio_file, CACHE_SUFFIX)
+    lrc_mtime = _mtime(lrc_file)
+    pitch_mtime = _mtime(pitch_file)
+
+    if (row is not None
+            and row["audio_mtime"] == stat.st_mtime
+            and row["audio_size"] == stat.st_size
+            and row["lrc_path"] == lrc_file and row["lrc_mtime"] == lrc_mtime
+            and row["pitch_path"] == pitch_file and row["pitch_mtime"] == pitch_mtime
+            and row["cache_path"] == cache_file):
+        return False
+
+    # Read everything first so a bad file leaves the song's catalog entry untouched
+    default_title = os.path.splitext(os.path.basename(audio_file))[0]
+    lyrics_changed = row is None or row["lrc_path"] != lrc_file
+    lrc_hash = row["lrc_hash"] if row is not None else None
+    if lrc_file is None:
+        lrc_hash = None
+    elif lyrics_changed or row["lrc_mtime"] != lrc_mtime:
+        new_hash = file_hash(lrc_file)
+        lyrics_changed = lyrics_changed or new_hash != lrc_hash
+        lrc_hash = new_hash
+
+    if lyrics_changed:
+        title, artist, word_list = default_title, None, []
+        words_json = None
+        if lrc_file is not None:
+            title, artist, word_list = parse_lrc(lrc_file)
+            title = title or default_title
+            words_json = json.dumps({"title": title, "artist": artist, "words": word_list})
+
+    pitch_changed = (row is None or row["pitch_path"] != pitch_file
+                     or row["pitch_mtime"] != pitch_mtime)
+    if pitch_changed:
+        pitch_json = None
+        if pitch_file is not None:
+            try:
+                with open(pitch_file, "r") as f:
+                    pitch_json = json.dumps(json.load(f), separators=(",", ":"))
+            except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+                # Catalog the song without pitch; leaving pitch_path empty retries next scan
+                print(f"⚠️ Ignoring pitch track {pitch_file}: {e}")
+                pitch_file, pitch_mtime = None, None
+
+    # Then write only what changed; unchanged lyrics and pitch data stay in place
+    if row is None:
+        song_id = conn.execute("INSERT INTO songs (title, audio_path) VALUES (?, ?)",
+                               (default_title, audio_file)).lastrowid
+    else:
+        song_id = row["id"]
+    conn.execute(
+        "UPDATE songs SET audio_mtime=?, audio_size=?, lrc_path=?, lrc_mtime=?, lrc_hash=?, "
+        "pitch_path=?, pitch_mtime=?, cache_path=? WHERE id=?",
+        (stat.st_mtime, stat.st_size, lrc_file, lrc_mtime, lrc_hash,
+         pitch_file, pitch_mtime, cache_file, song_id))
+
+    if lyrics_changed:
+        conn.execute("UPDATE songs SET title=?, artist=?, words_json=? WHERE id=?",
+                     (title, artist, words_json, song_id))
+        conn.execute("DELETE FROM songs_fts WHERE rowid=?", (song_id,))
+        conn.execute("INSERT INTO songs_fts (rowid, title, artist, lyrics) VALUES (?,?,?,?)",
+                     (song_id, title, artist or "", " ".join(word for _, word in word_list)))
+    if pitch_changed:
+        conn.execute("UPDATE songs SET pitch_json=? WHERE id=?", (pitch_json, song_id))
+    return True
+
+
+def update_catalog(conn, music_dir):
+    """Incrementally sync the catalog with every audio file under music_dir"""
+    music_dir = os.path.abspath(music_dir)
+    if not os.path.isdir(music_dir):
+        # An unmounted drive would otherwise look like every song was deleted
+        raise NotADirectoryError(f"Music folder not found: {music_dir}")
+    known = {row["audio_path"]: row for row in conn.execute(
+        "SELECT id, audio_path, audio_mtime, audio_size, lrc_path, lrc_mtime, lrc_hash, "
+        "pitch_path, pitch_mtime, cache_path FROM songs WHERE substr(audio_path, 1, ?) = ?",
+        (len(music_dir) + 1, music_dir + os.sep))}
+    seen = set()
+    changed = 0
+    failed = 0
+
+    with conn:
+        for dirpath, _, filenames in os.walk(music_dir):
+            for name in filenames:
+                if name.endswith(CACHE_SUFFIX) or not name.lower().endswith(AUDIO_EXTENSIONS):
+                    continue
+                audio_file = os.path.join(dirpath, name)
+                try:
+                    if _index_song(conn, audio_file, known.get(audio_file)):
+                        changed += 1
+                except FileNotFoundError as e:
+                    if not os.path.exists(audio_file):
+                        continue  # deleted mid-scan, treat as removed
+                    print(f"⚠️ Skipping {audio_file}: {e}")
+                    failed += 1
+                except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+                    print(f"⚠️ Skipping {audio_file}: {e}")
+                    failed += 1
+                seen.add(audio_file)  # failed songs keep their previous entry
+
+        removed = [known[path]["id"] for path in known if path not in seen]
+        for song_id in removed:
+            conn.execute("DELETE FROM songs WHERE id=?", (song_id,))
+            conn.execute("DELETE FROM songs_fts WHERE rowid=?", (song_id,))
+
+    return changed, len(removed), failed
+
+
+def record_cache(conn, song_id, cache_file):
+    """Remember a converted audio file so players can skip conversion next time"""
+    with conn:
+        conn.execute("UPDATE songs SET cache_path=? WHERE id=?",
+                     (os.path.abspath(cache_file), song_id))
+
+
+# -------- SEARCH & LOAD --------
+def _fts_query(text):
+    """Turn free text into an FTS5 query; only the last term is a prefix (type-ahead)"""
+    words = re.findall(r"\w+", text, flags=re.UNICODE)
+    terms = [f'"{word}"' for word in words]
+    # A one-letter prefix expands to a large share of the vocabulary and bm25 then
+    # has to score most of the catalog, so it is matched as a whole word instead
+    if terms and len(words[-1]) >= MIN_PREFIX:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search(conn, text, limit=20):
+    """Full-text search over title, artist and lyrics; best matches first"""
+    query = _fts_query(text)
+    if not query:
+        return []
+    sql = ("SELECT s.id, s.title, s.artist, s.audio_path FROM songs_fts "
+           "JOIN songs s ON s.id = songs_fts.rowid "
+           "WHERE songs_fts MATCH ? ORDER BY bm25(songs_fts, {}) LIMIT ?")
+
+    # Title/artist hits first: titles are short, so this pass stays cheap even for
+    # words found in nearly every song's lyrics
+    results = [dict(row) for row in conn.execute(
+        sql.format("10.0, 5.0, 0.0"), (f"{{title artist}} : ({query})", limit))]
+    if len(results) == limit:
+        return results
+
+    # Fill the rest from all columns (lyrics, or terms split across title and lyrics)
+    found = {song["id"] for song in results}
+    for row in conn.execute(sql.format("10.0, 5.0, 1.0"), (query, limit + len(found))):
+        if row["id"] not in found:
+            results.append(dict(row))
+            if len(results) == limit:
+                break
+    return results
+
+
+def load_song(conn, song_id):
+    """Load everything a player needs for one song in a single query"""
+    row = conn.execute("SELECT * FROM songs WHERE id=?", (song_id,)).fetchone()
+    if row is None:
+        raise KeyError(f"No song with id {song_id} in catalog")
+    meta = json.loads(row["words_json"]) if row["words_json"] else {"words": []}
+    cache_file = row["cache_path"]
+    if cache_file and (not os.path.exists(cache_file)
+                       or os.path.getmtime(cache_file) < (_mtime(row["audio_path"]) or 0)):
+        cache_file = None  # stale or deleted, player should re-convert
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "artist": row["artist"],
+        "audio_file": row["audio_path"],
+        "lrc_file": row["lrc_path"],
+        "pitch_file": row["pitch_path"],
+        "cache_file": cache_file,
+        "word_list": [(ts, word) for ts, word in meta["words"]],
+        "pitch": json.loads(row["pitch_json"]) if row["pitch_json"] else None,
+    }
+
+
+def cache_path_for(audio_file):
+    """Where players should write converted audio for a catalog song"""
+    return os.path.splitext(audio_file)[0] + CACHE_SUFFIX
+
+
+# -------- COMMAND LINE --------
+if __name__ == "__main__":
+    usage = ("Usage:\n"
+             "  python song_catalog.py scan <music folder>\n"
+             "  python song_catalog.py search <words...>\n"
+             "  python song_catalog.py show <song id>")
+    if len(sys.argv) < 3:
+        print(usage)
+        sys.exit(1)
+
+    command, args = sys.argv[1], sys.argv[2:]
+    conn = open_catalog()
+
+    if command == "scan":
+        start = time.perf_counter()
+        try:
+            changed, removed, failed = update_catalog(conn, args[0])
+        except NotADirectoryError as e:
+            print(f"❌ {e} - catalog left unchanged")
+            sys.exit(1)
+        print(f"✅ Catalog updated: {changed} added/changed, {removed} removed, "
+              f"{failed} skipped ({time.perf_counter() - start:.2f}s)")
+    elif command == "search":
+        start = time.perf_counter()
+        results = search(conn, " ".join(args))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for song in results:
+            print(f"{song['id']:>6}  {song['title']}" + (f" - {song['artist']}" if song["artist"] else ""))
+        print(f"🔎 {len(results)} result(s) in {elapsed_ms:.1f} ms")
+    elif command == "show":
+        try:
+            song = load_song(conn, int(args[0]))
+        except (ValueError, KeyError):
+            print(f"❌ Unknown song id {args[0]!r} - find one with: python song_catalog.py search <words>")
+            sys.exit(1)
+        print(f"🎵 {song['title']}" + (f" - {song['artist']}" if song["artist"] else ""))
+        print(f"📂 Audio: {song['audio_file']}")
+        print(f"📝 LRC:   {song['lrc_file']} ({len(song['word_list'])} lines)")
+        print(f"🎼 Pitch: {song['pitch_file']}")
+        print(f"💾 Cache: {song['cache_file']}")
+    else:
+        print(usage)
+        sys.exit(1)